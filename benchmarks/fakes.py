@@ -0,0 +1,159 @@
+"""
+Stand-ins for the external services the loaders talk to.
+
+FakeYahoo replaces the `yf` module inside loaders and serves synthetic
+histories. LocalConnection is a DuckDB-backed, Snowflake-shaped connection
+(cursor/execute/fetchall) holding the RAW tables, and write_pandas mirrors
+snowflake.connector.pandas_tools.write_pandas against it.
+"""
+import re
+
+import duckdb
+import pandas as pd
+
+# --- RAW tables in DuckDB types (see infra/tables/all_tables.sql) ---
+RAW_TABLES_DDL = {
+    "RAW_ASSET_SEED": """
+        ASSET_CODE VARCHAR, ASSET_CODE_SYSTEM VARCHAR, ASSET_NAME VARCHAR, ASSET_CLASS VARCHAR
+    """,
+    "RAW_ASSET_DETAILS": """
+        ASSET_CODE VARCHAR, ASSET_CODE_SYSTEM VARCHAR, COUNTRY VARCHAR, SHORTNAME VARCHAR,
+        LONGNAME VARCHAR, QUOTETYPE VARCHAR, SECTOR VARCHAR, INDUSTRY VARCHAR, CURRENCY VARCHAR,
+        EXCHANGE VARCHAR, SOURCE_SYSTEM VARCHAR, LOAD_TS TIMESTAMP
+    """,
+    "RAW_ASSET_PRICES": """
+        ASSET_CODE VARCHAR, PRICE_DATE DATE, PRICE_OPEN DOUBLE, PRICE_HIGH DOUBLE, PRICE_LOW DOUBLE,
+        PRICE_CLOSE DOUBLE, PRICE_ADJ_CLOSE DOUBLE, PRICE_VOLUME BIGINT, CURRENCY VARCHAR,
+        SOURCE_SYSTEM VARCHAR, LOAD_TS TIMESTAMP DEFAULT current_timestamp
+    """,
+    "RAW_EXCHANGE_RATES": """
+        CURRENCY_FROM VARCHAR, CURRENCY_TO VARCHAR, RATE_DATE DATE, EXCHANGE_RATE DOUBLE,
+        SOURCE_SYSTEM VARCHAR, LOAD_TS TIMESTAMP DEFAULT current_timestamp
+    """,
+    "RAW_TRANSACTIONS_XTB": """
+        ID VARCHAR, TYPE VARCHAR, TIME VARCHAR, COMMENT VARCHAR, SYMBOL VARCHAR, AMOUNT VARCHAR,
+        SOURCE_FILE VARCHAR, SOURCE_SYSTEM VARCHAR, LOAD_TS TIMESTAMP DEFAULT current_timestamp
+    """,
+    "RAW_STOCK_COUNTRY_MAPPING": """
+        SYMBOL VARCHAR, SUFFIX VARCHAR, YF_SUFFIX VARCHAR, COUNTRY_NAME VARCHAR, CONTINENT VARCHAR,
+        SOURCE_SYSTEM VARCHAR, LOAD_TS TIMESTAMP DEFAULT current_timestamp
+    """,
+    "RAW_LOADED_FILES": """
+        SOURCE_SYSTEM VARCHAR, SOURCE_FILE VARCHAR, FILE_FINGERPRINT VARCHAR, ROW_COUNT BIGINT,
+        LOAD_TS TIMESTAMP DEFAULT current_timestamp
+    """,
+}
+
+# --- Snowflake-only syntax used by the loaders, rewritten for DuckDB ---
+SQL_REWRITES = [
+    (re.compile(r"TRUNCATE\s+TABLE\s+(IF\s+EXISTS\s+)?", re.IGNORECASE), "DELETE FROM "),
+    (re.compile(r"TO_DATE\(('[^']*')\)", re.IGNORECASE), r"CAST(\1 AS DATE)"),
+    (re.compile(r"%s"), "?"),
+]
+
+
+class FakeTicker:
+
+    def __init__(self, yahoo, symbol):
+        self.yahoo = yahoo
+        self.symbol = symbol
+        self.info = yahoo.infos.get(symbol, {})
+
+    def history(self, start=None, end=None, interval="1d", **kwargs):
+        yahoo = self.yahoo
+        yahoo.requests += 1
+
+        data = yahoo.histories.get(self.symbol)
+        if data is None:
+            return pd.DataFrame()
+
+        if start is not None:
+            data = data[data.index >= pd.Timestamp(start)]
+        if end is not None:
+            data = data[data.index < pd.Timestamp(end)]
+
+        return data
+
+
+class FakeYahoo:
+    """Drop-in for the `yfinance` module serving in-memory histories and infos."""
+
+    def __init__(self, histories, infos=None):
+        self.histories = histories
+        self.infos = infos or {}
+        self.requests = 0
+
+    def Ticker(self, symbol):
+        return FakeTicker(self, symbol)
+
+
+class LocalCursor:
+
+    def __init__(self, con):
+        self.con = con
+        self.description = None
+
+    def execute(self, sql, params=None):
+        for pattern, replacement in SQL_REWRITES:
+            sql = pattern.sub(replacement, sql)
+
+        self.con.execute(sql, params or [])
+        self.description = self.con.description
+        return self
+
+    def fetchone(self):
+        return self.con.fetchone()
+
+    def fetchall(self):
+        return self.con.fetchall()
+
+    def close(self):
+        pass
+
+
+class LocalConnection:
+    """
+    DuckDB database with the RAW schema, shaped like a Snowflake connection.
+    close() is a no-op so loaders that close their connection can share it.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.con = duckdb.connect(path)
+        self.rows_written = {}
+
+        self.con.execute("CREATE SCHEMA IF NOT EXISTS RAW")
+
+        for table, columns in RAW_TABLES_DDL.items():
+            self.con.execute(f"CREATE TABLE IF NOT EXISTS RAW.{table} ({columns})")
+
+    def cursor(self):
+        return LocalCursor(self.con.cursor())
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+    def table(self, table):
+        return self.con.execute(f"SELECT * FROM RAW.{table}").df()
+
+    def count(self, table):
+        return self.con.execute(f"SELECT COUNT(*) FROM RAW.{table}").fetchone()[0]
+
+    def write(self, df, table):
+        columns = ", ".join(df.columns)
+        self.con.register("bench_df", df)
+
+        try:
+            self.con.execute(f"INSERT INTO RAW.{table} ({columns}) SELECT {columns} FROM bench_df")
+        finally:
+            self.con.unregister("bench_df")
+
+        self.rows_written[table] = self.rows_written.get(table, 0) + len(df)
+
+
+def write_pandas(conn, df, table_name, schema=None, **kwargs):
+    """Mirrors snowflake.connector.pandas_tools.write_pandas for a LocalConnection."""
+    conn.write(df, table_name)
+    return True, 1, len(df), None
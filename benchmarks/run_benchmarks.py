@@ -0,0 +1,475 @@
+"""
+End-to-end benchmark suite - times the pipeline on synthetic data.
+
+Stages:
+1. Generate synthetic seeds, XTB workbooks and price/FX histories.
+2. Run every loader in ingestion.run_loaders.LOADERS against a fake Yahoo
+   provider and a local DuckDB copy of the RAW schema.
+3. Optionally (--dbt-target with --bench-database) push the synthetic RAW
+   tables to an isolated benchmark database and run the dbt models and tests
+   on it. The production INVESTMENTS database is refused, and the dbt target
+   must point at the benchmark database (checked by the
+   assert_benchmark_database macro before anything is written).
+
+Each stage records wall time, rows written and memory (see METRICS).
+Results are written to --results and compared with --baseline; a stage more
+than --threshold slower than its baseline fails the run. tracemalloc slows
+traced stages down, so stages are only compared with baseline stages that
+had the same `traced` setting; use --no-trace-memory for clean timings.
+
+Usage:
+    python -m benchmarks.run_benchmarks --assets 200 --years 5 --transactions 50000
+    python -m benchmarks.run_benchmarks --update-baseline
+    python -m benchmarks.run_benchmarks --dbt-target bench --bench-database INVESTMENTS_BENCH
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime
+from contextlib import ExitStack
+from unittest import mock
+
+from benchmarks import synthetic
+from benchmarks.fakes import FakeYahoo, LocalConnection, write_pandas as local_write_pandas
+
+from ingestion.run_loaders import LOADERS, run_loader
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# --- Logging setup ---
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+DEFAULT_RESULTS_PATH = os.path.join(BENCHMARKS_DIR, "results", "latest.json")
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARKS_DIR, "baseline.json")
+
+# --- Production database the benchmark must never write to ---
+PROTECTED_DATABASE = "INVESTMENTS"
+
+# --- Meaning of the per-stage memory fields, written into every results file ---
+METRICS = {
+    "traced": "Stage ran under tracemalloc, which inflates its timing",
+    "python_peak_mb": "Peak Python allocations in this process (tracemalloc); excludes "
+                      "child processes such as dbt and parser workers. null when not traced",
+    "child_max_rss_growth_mb": "How much this stage raised the largest RSS of any finished child "
+                               "process (getrusage RUSAGE_CHILDREN high-water mark). 0 means no "
+                               "child exceeded an earlier one; not a per-stage peak. null on Windows",
+}
+
+# --- Stages faster than this are too noisy to flag as regressions ---
+MIN_REGRESSION_SECONDS = 0.5
+
+# --- dbt commands timed in the models stage, in order ---
+DBT_COMMANDS = [
+    ("dbt seed",              ["dbt", "seed"]),
+    ("dbt run (full refresh)", ["dbt", "run", "--full-refresh"]),
+    ("dbt run (incremental)", ["dbt", "run"]),
+    ("dbt test",              ["dbt", "test"]),
+]
+
+
+def child_max_rss_mb():
+    """Largest RSS of any finished child process so far (dbt, parser workers), if measurable."""
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+def measure(name, func, trace_memory=True):
+    """Runs func() and returns its timing/memory record plus func's result."""
+    logger.info(f"⏱️  Stage: {name}")
+
+    child_rss_before = child_max_rss_mb()
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        result = func()
+        status = "ok"
+    except Exception as e:
+        logger.error(f"❌ Stage {name} failed: {e}", exc_info=True)
+        result = None
+        status = "failed"
+
+    seconds = time.perf_counter() - start
+
+    python_peak_mb = None
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        python_peak_mb = round(peak / (1024 * 1024), 1)
+
+    child_rss_after = child_max_rss_mb()
+    child_rss_growth_mb = None
+    if child_rss_after is not None:
+        child_rss_growth_mb = round(child_rss_after - child_rss_before, 1)
+
+    record = {
+        "stage": name,
+        "status": status,
+        "seconds": round(seconds, 3),
+        "traced": trace_memory,
+        "python_peak_mb": python_peak_mb,
+        "child_max_rss_growth_mb": child_rss_growth_mb,
+    }
+
+    logger.info(
+        f"   {status} in {record['seconds']}s, python peak {python_peak_mb} MB, "
+        f"child RSS growth {child_rss_growth_mb} MB"
+    )
+    return record, result
+
+
+def generate_data(args, work_dir):
+    """Builds the synthetic dataset and writes XTB workbooks into the inbox."""
+    assets = synthetic.build_assets(args.assets, seed=args.seed)
+    transactions = synthetic.build_transactions(assets, args.years, args.transactions, seed=args.seed)
+
+    inbox_path = os.path.join(work_dir, "inbox")
+    paths = synthetic.write_xtb_workbooks(transactions, args.files, inbox_path)
+
+    data = {
+        "assets": assets,
+        "asset_seed": synthetic.build_asset_seed(assets),
+        "histories": {
+            **synthetic.build_price_histories(assets, args.years, seed=args.seed),
+            **synthetic.build_fx_histories(args.years, seed=args.seed),
+        },
+        "infos": synthetic.build_asset_infos(assets),
+        "inbox_path": inbox_path,
+    }
+
+    data["asset_seed"].to_csv(os.path.join(work_dir, "raw_asset_seed.csv"), index=False)
+    data["rows"] = len(transactions) + sum(len(h) for h in data["histories"].values())
+
+    logger.info(f"Generated {len(assets)} assets, {len(transactions)} transactions in {len(paths)} files")
+    return data
+
+
+def local_patches(module, ctx, yahoo, work_dir, inbox_path):
+    """Patches a loader module so it talks to the fakes instead of Snowflake/Yahoo."""
+    patches = [mock.patch("snowflake.connector.pandas_tools.write_pandas", local_write_pandas)]
+
+    replacements = {
+        "yf": yahoo,
+        "get_connection": lambda: ctx,
+        "write_pandas": local_write_pandas,
+        "INBOX_PATH": inbox_path,
+        "CACHE_PATH": os.path.join(work_dir, "cache", "country_mapping.json"),
+    }
+
+    for attr, value in replacements.items():
+        if hasattr(module, attr):
+            patches.append(mock.patch.object(module, attr, value))
+
+    return patches
+
+
+def run_loader_stages(data, work_dir, trace_memory):
+    """Runs every registered loader against the local engine. Returns stage records."""
+    ctx = LocalConnection()
+    yahoo = FakeYahoo(data["histories"], data["infos"])
+
+    # --- dbt seed populates RAW_ASSET_SEED before loaders in the real pipeline ---
+    ctx.write(data["asset_seed"], "RAW_ASSET_SEED")
+
+    records = []
+
+    for name, func in LOADERS:
+        module = sys.modules[func.__module__]
+
+        def run():
+            before = dict(ctx.rows_written)
+
+            with ExitStack() as stack:
+                for patch in local_patches(module, ctx, yahoo, work_dir, data["inbox_path"]):
+                    stack.enter_context(patch)
+
+                if not run_loader(name, func, ctx):
+                    raise RuntimeError(f"{name} loader failed")
+
+            return sum(ctx.rows_written.values()) - sum(before.values())
+
+        record, rows = measure(f"loader: {name}", run, trace_memory)
+        record["rows"] = rows
+        records.append(record)
+
+    return records, ctx
+
+
+def push_raw_tables(local_ctx, database):
+    """Replaces the RAW tables of the benchmark database with the synthetic ones."""
+    from snowflake.connector.pandas_tools import write_pandas
+    from ingestion.snowflake_connection import get_connection
+
+    if database.upper() == PROTECTED_DATABASE:
+        raise RuntimeError(f"Refusing to push synthetic data into {PROTECTED_DATABASE}")
+
+    ctx = get_connection()
+    rows = 0
+
+    try:
+        cs = ctx.cursor()
+        cs.execute(f"CREATE SCHEMA IF NOT EXISTS {database}.RAW")
+        cs.close()
+
+        for table in local_ctx.rows_written:
+            df = local_ctx.table(table)
+            success, _, nrows, _ = write_pandas(
+                ctx,
+                df,
+                table,
+                database=database,
+                schema="RAW",
+                auto_create_table=True,
+                overwrite=True
+            )
+
+            if not success:
+                raise RuntimeError(f"Failed to push {table}")
+
+            rows += nrows
+            logger.info(f"Pushed {nrows} rows into {database}.RAW.{table}")
+    finally:
+        ctx.close()
+
+    return rows
+
+
+def dbt_args(target, database):
+    """Target and vars pointing every dbt command at the benchmark database."""
+    return ["--target", target, "--vars", json.dumps({"raw_database": database})]
+
+
+def assert_benchmark_database(target, database):
+    """Fails unless the dbt target writes to the (non-production) benchmark database."""
+    result = subprocess.run(
+        ["dbt", "run-operation", "assert_benchmark_database"] + dbt_args(target, database),
+        cwd=PROJECT_DIR
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(f"dbt target {target} is not the isolated benchmark database {database}")
+
+
+def run_dbt(command, target, database):
+    """Runs a dbt command and returns the rows affected from run_results.json."""
+    result = subprocess.run(command + dbt_args(target, database), cwd=PROJECT_DIR)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} failed")
+
+    with open(os.path.join(PROJECT_DIR, "target", "run_results.json")) as f:
+        run_results = json.load(f)
+
+    return sum(
+        (node.get("adapter_response") or {}).get("rows_affected") or 0
+        for node in run_results["results"]
+    )
+
+
+def run_dbt_stages(local_ctx, target, database, trace_memory):
+    """
+    Pushes the synthetic RAW tables and times the dbt models on `target`.
+    dbt runs in a child process, so its stages are never traced.
+    """
+    records = []
+
+    # --- Nothing is written unless the target is the isolated benchmark database ---
+    record, _ = measure("dbt database check", lambda: assert_benchmark_database(target, database), False)
+    records.append(record)
+
+    if record["status"] != "ok":
+        return records
+
+    seed_name, seed_command = DBT_COMMANDS[0]
+    record, rows = measure(seed_name, lambda: run_dbt(seed_command, target, database), False)
+    record["rows"] = rows
+    records.append(record)
+
+    # --- Push after dbt seed so the synthetic RAW_ASSET_SEED replaces the repo seed ---
+    record, rows = measure("push RAW tables", lambda: push_raw_tables(local_ctx, database), trace_memory)
+    record["rows"] = rows
+    records.append(record)
+
+    for name, command in DBT_COMMANDS[1:]:
+        record, rows = measure(name, lambda: run_dbt(command, target, database), False)
+        record["rows"] = rows
+        records.append(record)
+
+    return records
+
+
+def find_regressions(results, baseline, threshold):
+    """Returns stages that are more than `threshold` slower than the baseline."""
+    if baseline["scale"] != results["scale"]:
+        logger.warning("⚠️  Baseline was recorded at a different scale, skipping comparison")
+        return []
+
+    baseline_stages = {r["stage"]: r for r in baseline["stages"]}
+    regressions = []
+
+    for record in results["stages"]:
+        previous_record = baseline_stages.get(record["stage"])
+
+        if previous_record is None:
+            continue
+
+        # --- tracemalloc overhead makes traced and untraced timings incomparable ---
+        if previous_record.get("traced", True) != record["traced"]:
+            logger.warning(f"⚠️  {record['stage']}: tracemalloc setting differs from baseline, not compared")
+            continue
+
+        previous = previous_record["seconds"]
+
+        if max(previous, record["seconds"]) < MIN_REGRESSION_SECONDS:
+            continue
+
+        if record["seconds"] > previous * (1 + threshold):
+            regressions.append({
+                "stage": record["stage"],
+                "baseline_seconds": previous,
+                "seconds": record["seconds"],
+                "slowdown_pct": round((record["seconds"] / previous - 1) * 100, 1),
+            })
+
+    return regressions
+
+
+def write_json(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, default=str)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the ingestion loaders and dbt models on synthetic data.")
+    parser.add_argument("--assets", type=int, default=50, help="Number of synthetic assets")
+    parser.add_argument("--years", type=float, default=3, help="Years of price/FX/transaction history")
+    parser.add_argument("--transactions", type=int, default=10_000, help="Number of XTB transactions")
+    parser.add_argument("--files", type=int, default=4, help="Number of XTB workbooks to split transactions into")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic data")
+    parser.add_argument("--dbt-target", help="dbt target to run the models on (skipped if not set)")
+    parser.add_argument(
+        "--bench-database",
+        help="Isolated Snowflake database the dbt target writes to; required with --dbt-target"
+    )
+    parser.add_argument("--results", default=DEFAULT_RESULTS_PATH, help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="Baseline results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--keep-data", action="store_true", help="Keep the generated data directory")
+    parser.add_argument(
+        "--no-trace-memory",
+        action="store_true",
+        help="Skip tracemalloc so timings carry no tracing overhead (python_peak_mb is then null)"
+    )
+    args = parser.parse_args()
+
+    if args.dbt_target and not args.bench_database:
+        parser.error("--dbt-target requires --bench-database")
+
+    if args.bench_database and args.bench_database.upper() == PROTECTED_DATABASE:
+        parser.error(f"--bench-database must not be the production {PROTECTED_DATABASE} database")
+
+    return args
+
+
+def main():
+    args = parse_args()
+
+    logger.info("="*60)
+    logger.info("📊 STARTING BENCHMARKS")
+    logger.info("="*60)
+
+    work_dir = tempfile.mkdtemp(prefix="investments_bench_")
+    trace_memory = not args.no_trace_memory
+    stages = []
+
+    try:
+        record, data = measure("generate synthetic data", lambda: generate_data(args, work_dir), trace_memory)
+        stages.append(record)
+
+        if data is not None:
+            record["rows"] = data["rows"]
+
+            loader_records, local_ctx = run_loader_stages(data, work_dir, trace_memory)
+            stages.extend(loader_records)
+
+            if args.dbt_target:
+                stages.extend(run_dbt_stages(local_ctx, args.dbt_target, args.bench_database, trace_memory))
+    finally:
+        if args.keep_data:
+            logger.info(f"Synthetic data kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        "run_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "scale": {
+            "assets": args.assets,
+            "years": args.years,
+            "transactions": args.transactions,
+            "files": args.files,
+            "seed": args.seed,
+            "dbt_target": args.dbt_target,
+            "bench_database": args.bench_database,
+        },
+        "metrics": METRICS,
+        "stages": stages,
+        "regressions": [],
+    }
+
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline) as f:
+            results["regressions"] = find_regressions(results, json.load(f), args.threshold)
+
+    write_json(args.results, results)
+    logger.info(f"✅ Results written to {args.results}")
+
+    if args.update_baseline:
+        write_json(args.baseline, results)
+        logger.info(f"✅ Baseline updated at {args.baseline}")
+
+    failed = [r["stage"] for r in stages if r["status"] != "ok"]
+
+    for regression in results["regressions"]:
+        logger.error(
+            f"🐢 Regression in {regression['stage']}: {regression['seconds']}s "
+            f"vs {regression['baseline_seconds']}s baseline (+{regression['slowdown_pct']}%)"
+        )
+
+    if failed:
+        logger.error(f"❌ Failed stages: {', '.join(failed)}")
+
+    if failed or results["regressions"]:
+        sys.exit(1)
+
+    logger.info("="*60)
+    logger.info("🏁 BENCHMARKS COMPLETED SUCCESSFULLY!")
+    logger.info("="*60)
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Synthetic data generators for the benchmark suite.
+
+Produces an asset seed, XTB-layout transaction workbooks and daily price/FX
+histories at a configurable scale. Everything is driven by a seeded RNG so
+the same scale always produces the same data.
+"""
+import os
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from ingestion.brokers.xtb import SHEET_NAME, HEADER_ROW
+
+# --- Exchange suffixes used for synthetic assets: (XTB suffix, Yahoo suffix, currency) ---
+LISTINGS = [
+    ("US", "", "USD"),
+    ("DE", ".DE", "EUR"),
+    ("UK", ".L", "GBP"),
+    ("FR", ".PA", "EUR"),
+    ("NL", ".AS", "EUR"),
+]
+
+# --- Currency pairs fetched by the exchange rates loader ---
+FX_TICKERS = {
+    "USDEUR=X": 0.92,
+    "GBPEUR=X": 1.17,
+}
+
+# --- XTB transaction types and their share of generated rows ---
+TRANSACTION_TYPES = [
+    ("Stock purchase", 0.55),
+    ("Stock sale", 0.15),
+    ("Divident", 0.12),
+    ("Withholding Tax", 0.10),
+    ("Deposit", 0.08),
+]
+
+
+def build_assets(n_assets, seed=42):
+    """Returns the synthetic asset universe, one row per asset."""
+    rng = np.random.default_rng(seed)
+    rows = []
+
+    for i in range(n_assets):
+        xtb_suffix, yf_suffix, currency = LISTINGS[i % len(LISTINGS)]
+        code = f"SYN{i:05d}"
+
+        rows.append({
+            "ASSET_CODE": code,
+            "ASSET_CODE_SYSTEM": f"{code}{yf_suffix}",
+            "ASSET_NAME": f"Synthetic Asset {i}",
+            "ASSET_CLASS": "ETF" if rng.random() < 0.3 else "STOCK",
+            "XTB_SYMBOL": f"{code}.{xtb_suffix}",
+            "CURRENCY": currency,
+            "START_PRICE": round(float(rng.uniform(5, 500)), 2),
+        })
+
+    return pd.DataFrame(rows)
+
+
+def build_asset_seed(assets):
+    """Returns the asset seed in the layout of seeds/raw_asset_seed.csv."""
+    return assets[["ASSET_CODE", "ASSET_CODE_SYSTEM", "ASSET_NAME", "ASSET_CLASS"]].copy()
+
+
+def history_dates(years, end_date=None):
+    """Business days covering `years` years up to yesterday."""
+    end_date = end_date or date.today() - timedelta(days=1)
+    start_date = end_date - timedelta(days=int(365.25 * years))
+    return pd.bdate_range(start_date, end_date)
+
+
+def build_price_histories(assets, years, seed=42):
+    """
+    Returns {yahoo_symbol: DataFrame} of daily OHLCV bars shaped like
+    yfinance's Ticker.history(auto_adjust=False), from a geometric random walk.
+    """
+    rng = np.random.default_rng(seed)
+    dates = history_dates(years)
+    histories = {}
+
+    for asset in assets.itertuples():
+        returns = rng.normal(0.0003, 0.015, len(dates))
+        close = asset.START_PRICE * np.exp(np.cumsum(returns))
+        spread = np.abs(rng.normal(0, 0.01, len(dates))) * close
+
+        histories[asset.ASSET_CODE_SYSTEM] = pd.DataFrame(
+            {
+                "Open": close - spread / 2,
+                "High": close + spread,
+                "Low": close - spread,
+                "Close": close,
+                "Adj Close": close * 0.98,
+                "Volume": rng.integers(1_000, 5_000_000, len(dates)),
+            },
+            index=dates,
+        )
+
+    return histories
+
+
+def build_fx_histories(years, seed=42):
+    """Returns {yahoo_fx_ticker: DataFrame} with a daily Close rate."""
+    rng = np.random.default_rng(seed)
+    dates = history_dates(years)
+
+    return {
+        ticker: pd.DataFrame(
+            {"Close": start_rate * np.exp(np.cumsum(rng.normal(0, 0.003, len(dates))))},
+            index=dates,
+        )
+        for ticker, start_rate in FX_TICKERS.items()
+    }
+
+
+def build_asset_infos(assets):
+    """Returns {yahoo_symbol: info dict} shaped like yfinance's Ticker.info."""
+    return {
+        asset.ASSET_CODE_SYSTEM: {
+            "shortName": asset.ASSET_NAME,
+            "longName": f"{asset.ASSET_NAME} Holdings",
+            "quoteType": "ETF" if asset.ASSET_CLASS == "ETF" else "EQUITY",
+            "sector": "Technology",
+            "industry": "Software",
+            "currency": asset.CURRENCY,
+            "exchange": asset.XTB_SYMBOL.split(".")[-1],
+            "country": "Synthetic",
+        }
+        for asset in assets.itertuples()
+    }
+
+
+def build_transactions(assets, years, n_transactions, seed=42):
+    """Returns synthetic XTB cash operations, ordered by time."""
+    rng = np.random.default_rng(seed)
+
+    end_ts = datetime.combine(date.today() - timedelta(days=1), datetime.min.time())
+    start_ts = end_ts - timedelta(days=int(365.25 * years))
+    offsets = np.sort(rng.integers(0, int((end_ts - start_ts).total_seconds()), n_transactions))
+
+    types = [name for name, _ in TRANSACTION_TYPES]
+    weights = [share for _, share in TRANSACTION_TYPES]
+    picked_types = rng.choice(types, size=n_transactions, p=weights)
+    picked_assets = rng.integers(0, len(assets), n_transactions)
+
+    rows = []
+    for i in range(n_transactions):
+        tx_type = picked_types[i]
+        asset = assets.iloc[picked_assets[i]]
+        quantity = int(rng.integers(1, 50))
+        price = round(float(asset.START_PRICE * rng.uniform(0.8, 1.2)), 2)
+
+        if tx_type == "Stock purchase":
+            comment = f"OPEN BUY {quantity} @ {price}"
+            amount = -quantity * price
+        elif tx_type == "Stock sale":
+            comment = f"CLOSE BUY {quantity} @ {price}"
+            amount = quantity * price
+        elif tx_type == "Deposit":
+            comment = "Deposit"
+            amount = float(rng.integers(100, 5_000))
+        else:
+            comment = f"{asset.XTB_SYMBOL} {tx_type}"
+            amount = round(float(rng.uniform(-20, 50)), 2)
+
+        rows.append({
+            "ID": 100_000 + i,
+            "Type": tx_type,
+            "Time": start_ts + timedelta(seconds=int(offsets[i])),
+            "Comment": comment,
+            "Symbol": None if tx_type == "Deposit" else asset.XTB_SYMBOL,
+            "Amount": round(amount, 2),
+        })
+
+    return pd.DataFrame(rows)
+
+
+def write_xtb_workbooks(transactions, n_files, inbox_path):
+    """
+    Splits transactions into `n_files` consecutive XTB exports in the
+    "CASH OPERATION HISTORY" layout the XTB parser reads. Returns the paths.
+    """
+    os.makedirs(inbox_path, exist_ok=True)
+    paths = []
+
+    for i, positions in enumerate(np.array_split(np.arange(len(transactions)), n_files)):
+        chunk = transactions.iloc[positions]
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(SHEET_NAME)
+
+        # --- Account summary rows above the header ---
+        for summary_row in range(1, HEADER_ROW):
+            ws.append([None, f"Synthetic XTB account summary {summary_row}"])
+
+        ws.append([None, "ID", "Type", "Time", "Comment", "Symbol", "Amount", None])
+        for row in chunk.itertuples(index=False):
+            ws.append([None, int(row.ID), row.Type, row.Time.to_pydatetime(), row.Comment, row.Symbol, float(row.Amount), None])
+        ws.append([None, "Total", None, None, None, None, round(float(chunk["Amount"].sum()), 2), None])
+
+        path = os.path.join(inbox_path, f"xtb_export_{i:03d}.xlsx")
+        wb.save(path)
+        paths.append(path)
+
+    return paths
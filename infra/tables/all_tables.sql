@@ -75,6 +75,31 @@ create or replace TABLE INVESTMENTS.RAW.RAW_TRANSACTIONS_XTB (
 	LOAD_TS TIMESTAMP_NTZ(9) DEFAULT CURRENT_TIMESTAMP()
 );
 
+create or replace TABLE INVESTMENTS.RAW.RAW_LOADED_FILES (
+	SOURCE_SYSTEM VARCHAR(50) NOT NULL,
+	SOURCE_FILE VARCHAR(16777216),
+	FILE_FINGERPRINT VARCHAR(64) NOT NULL,
+	ROW_COUNT NUMBER(38,0),
+	LOAD_TS TIMESTAMP_NTZ(9) DEFAULT CURRENT_TIMESTAMP(),
+	primary key (SOURCE_SYSTEM, FILE_FINGERPRINT)
+);
+
+create or replace TABLE INVESTMENTS.RAW.DBT_TEST_WATERMARKS (
+	MODEL_NAME VARCHAR(255) NOT NULL,
+	WATERMARK_TS TIMESTAMP_NTZ(9) NOT NULL,
+	DBT_UPDATED_AT TIMESTAMP_NTZ(9) NOT NULL
+);
+
+create or replace TABLE INVESTMENTS.RAW.RAW_STOCK_COUNTRY_MAPPING (
+	SYMBOL VARCHAR(16777216),
+	SUFFIX VARCHAR(10),
+	YF_SUFFIX VARCHAR(10),
+	COUNTRY_NAME VARCHAR(100),
+	CONTINENT VARCHAR(50),
+	SOURCE_SYSTEM VARCHAR(50),
+	LOAD_TS TIMESTAMP_NTZ(9) DEFAULT CURRENT_TIMESTAMP()
+);
+
 
 
 create or replace schema INVESTMENTS.STAGING;
@@ -223,6 +248,15 @@ create or replace TABLE INVESTMENTS.PROD.FCT_ASSET_PRICES (
 	LOAD_TS TIMESTAMP_NTZ(9),
 	DBT_UPDATED_AT TIMESTAMP_NTZ(9) DEFAULT CURRENT_TIMESTAMP()
 );
+create or replace TABLE INVESTMENTS.PROD.FCT_ASSET_PRICES_EUR (
+	ASSET_ID VARCHAR(32) NOT NULL,
+	DATE_ID NUMBER(38,0) NOT NULL,
+	PRICE_CURRENCY_ID VARCHAR(16777216),
+	PRICE_ADJ_CLOSE NUMBER(10,2),
+	EXCHANGE_RATE_EUR NUMBER(10,4),
+	PRICE_ADJ_CLOSE_EUR NUMBER(18,6),
+	DBT_UPDATED_AT TIMESTAMP_NTZ(9)
+);
 create or replace TABLE INVESTMENTS.PROD.FCT_TRANSACTIONS (
 	TRANSACTION_ID VARCHAR(100),
 	TRANSACTION_DATE_ID NUMBER(38,0),
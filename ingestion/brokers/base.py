@@ -0,0 +1,62 @@
+"""
+Broker parser plugin interface.
+
+Each broker export format is handled by a BrokerParser subclass that knows how
+to recognise its files, stream their rows and map them to the canonical raw
+transaction schema. Parsers are registered in ingestion/brokers/registry.py.
+"""
+import hashlib
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+# --- Canonical raw transaction columns every parser must produce ---
+CANONICAL_COLUMNS = ["ID", "TYPE", "TIME", "COMMENT", "SYMBOL", "AMOUNT"]
+
+# --- Tracking columns added by the loader ---
+TRACKING_COLUMNS = ["SOURCE_FILE", "SOURCE_SYSTEM", "LOAD_TS"]
+
+
+def file_fingerprint(path, chunk_size=1024 * 1024):
+    """Returns the SHA-256 of a file's contents, used to skip already loaded files."""
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class BrokerParser(ABC):
+    """
+    Base class for broker transaction parsers.
+
+    Subclasses set `source_system` and `raw_table`, and implement `detect`
+    and `iter_rows` (a parser missing either cannot be instantiated). Rows
+    are yielded as dicts keyed by the broker's own column names and mapped to
+    CANONICAL_COLUMNS through `column_map`.
+    """
+
+    source_system = None
+    raw_table = None
+    column_map = {}
+
+    @abstractmethod
+    def detect(self, path):
+        """Returns True if the file at `path` is an export of this broker."""
+
+    @abstractmethod
+    def iter_rows(self, path):
+        """Yields one dict per transaction row in the file."""
+
+    def to_canonical(self, rows):
+        """Maps streamed rows to a DataFrame with CANONICAL_COLUMNS, dropping empty rows."""
+        df = pd.DataFrame(list(rows)).rename(columns=self.column_map)
+        df = df.reindex(columns=CANONICAL_COLUMNS)
+
+        return df.dropna(how="all").reset_index(drop=True)
+
+    def parse(self, path):
+        """Reads a whole file into the canonical schema."""
+        return self.to_canonical(self.iter_rows(path))
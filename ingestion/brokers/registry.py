@@ -0,0 +1,29 @@
+"""
+Broker parser registry - maps inbox files to the parser that understands them.
+"""
+import os
+
+from ingestion.brokers.xtb import XtbParser
+
+# --- Parser registry ---
+# Add new brokers here. The first parser whose detect() matches a file wins.
+BROKER_PARSERS = [
+    XtbParser(),
+]
+
+
+def detect_parser(path):
+    """Returns the registered parser for a file, or None if no broker matches."""
+    for parser in BROKER_PARSERS:
+        if parser.detect(path):
+            return parser
+
+    return None
+
+
+def scan_inbox(inbox_path):
+    """Yields every file path under the inbox directory, in a stable order."""
+    for root, dirs, files in os.walk(inbox_path):
+        dirs.sort()
+        for filename in sorted(files):
+            yield os.path.join(root, filename)
@@ -0,0 +1,64 @@
+"""
+XTB broker parser - XTB Portugal "CASH OPERATION HISTORY" Excel exports.
+"""
+from openpyxl import load_workbook
+
+from ingestion.brokers.base import BrokerParser
+
+# --- XTB export layout ---
+SHEET_NAME = "CASH OPERATION HISTORY"
+HEADER_ROW = 11  # 10 rows of account summary precede the header
+
+
+class XtbParser(BrokerParser):
+
+    source_system = "xtb_portugal"
+    raw_table = "RAW_TRANSACTIONS_XTB"
+    column_map = {
+        "ID": "ID",
+        "Type": "TYPE",
+        "Time": "TIME",
+        "Comment": "COMMENT",
+        "Symbol": "SYMBOL",
+        "Amount": "AMOUNT"
+    }
+
+    def detect(self, path):
+        if not path.lower().endswith(".xlsx"):
+            return False
+
+        try:
+            wb = load_workbook(path, read_only=True)
+        except Exception:
+            return False
+
+        try:
+            return SHEET_NAME in wb.sheetnames
+        finally:
+            wb.close()
+
+    def iter_rows(self, path):
+        """
+        Streams the sheet row by row (read-only mode) instead of loading it
+        into memory. Values are yielded as strings, like the previous
+        pd.read_excel(dtype=str) loader, with empty cells as None.
+        """
+        wb = load_workbook(path, read_only=True, data_only=True)
+
+        try:
+            rows = wb[SHEET_NAME].iter_rows(min_row=HEADER_ROW, values_only=True)
+            header = next(rows, None)
+
+            if header is None:
+                return
+
+            # --- Keep only named columns (drops the blank first/last columns) ---
+            columns = [(i, name) for i, name in enumerate(header) if name in self.column_map]
+
+            for row in rows:
+                yield {
+                    name: str(row[i]) if i < len(row) and row[i] is not None else None
+                    for i, name in columns
+                }
+        finally:
+            wb.close()
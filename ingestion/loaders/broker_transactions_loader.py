@@ -0,0 +1,200 @@
+import os
+import logging
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from snowflake.connector.pandas_tools import write_pandas
+
+from ingestion.snowflake_connection import get_connection
+from ingestion.brokers.base import file_fingerprint
+from ingestion.brokers.registry import BROKER_PARSERS, detect_parser, scan_inbox
+
+# --- Logging setup ---
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# --- Table tracking which files were already loaded, by content fingerprint ---
+RAW_LOADED_FILES_TABLE = "RAW_LOADED_FILES"
+
+# --- Inbox scanned for broker exports (one folder for all brokers) ---
+INBOX_PATH = os.getenv("BROKER_INBOX_PATH", os.path.join("data", "inbox"))
+
+# --- IDs checked against the raw table per query ---
+ID_LOOKUP_BATCH_SIZE = 1000
+
+# --- Files are parsed in parallel across processes ---
+MAX_WORKERS = int(os.getenv("BROKER_PARSE_WORKERS", os.cpu_count() or 1))
+
+
+def parse_file(path, loaded_fingerprints):
+    """
+    Detects the broker of a file and parses it into the canonical schema.
+    Runs in a worker process. Returns (source_system, path, fingerprint, df),
+    with df None for files that are unknown or already loaded.
+    """
+    parser = detect_parser(path)
+
+    if parser is None:
+        return None, path, None, None
+
+    fingerprint = file_fingerprint(path)
+
+    if fingerprint in loaded_fingerprints.get(parser.source_system, set()):
+        return parser.source_system, path, fingerprint, None
+
+    return parser.source_system, path, fingerprint, parser.parse(path)
+
+
+def get_loaded_fingerprints(cs):
+    """Returns {source_system: {fingerprint, ...}} of files already loaded."""
+    cs.execute(f"SELECT SOURCE_SYSTEM, FILE_FINGERPRINT FROM RAW.{RAW_LOADED_FILES_TABLE}")
+
+    loaded = {}
+    for source_system, fingerprint in cs.fetchall():
+        loaded.setdefault(source_system, set()).add(fingerprint)
+
+    return loaded
+
+
+def get_existing_ids(cs, raw_table, ids):
+    """
+    Returns which of `ids` are already in the raw table. Only the given IDs
+    are looked up (in batches), so the cost tracks the new files rather than
+    the table's history.
+    """
+    ids = list(ids)
+    existing = set()
+
+    for start in range(0, len(ids), ID_LOOKUP_BATCH_SIZE):
+        batch = ids[start:start + ID_LOOKUP_BATCH_SIZE]
+        placeholders = ", ".join(["%s"] * len(batch))
+
+        cs.execute(f"SELECT ID FROM RAW.{raw_table} WHERE ID IN ({placeholders})", batch)
+        existing.update(row[0] for row in cs.fetchall())
+
+    return existing
+
+
+def load_broker(ctx, parser, parsed_files, load_ts):
+    """
+    Appends the new rows of one broker's files to its raw table and records
+    the files' fingerprints. Rows whose ID is already loaded (broker exports
+    overlap in time) are skipped.
+    """
+    cs = ctx.cursor()
+
+    try:
+        dfs = []
+        for path, fingerprint, df in parsed_files:
+            df = df.assign(
+                SOURCE_FILE=os.path.basename(path),
+                SOURCE_SYSTEM=parser.source_system,
+                LOAD_TS=load_ts
+            )
+            dfs.append(df)
+            logger.info(f"Parsed {len(df)} rows from {os.path.basename(path)}")
+
+        combined_df = pd.concat(dfs, ignore_index=True)
+        logger.info(f"[{parser.source_system}] Rows before dedup: {combined_df.shape[0]}")
+
+        # --- Deduplicate by ID, within the new files and against the table ---
+        combined_df = combined_df.drop_duplicates(subset=["ID"], keep="first")
+
+        existing_ids = get_existing_ids(cs, parser.raw_table, combined_df["ID"].dropna())
+        combined_df = combined_df[~combined_df["ID"].isin(existing_ids)]
+        logger.info(f"[{parser.source_system}] Rows after dedup: {combined_df.shape[0]}")
+
+        if not combined_df.empty:
+            success, nchunks, nrows, _ = write_pandas(
+                conn=ctx,
+                df=combined_df.reset_index(drop=True),
+                table_name=parser.raw_table,
+                schema="RAW"
+            )
+
+            if not success:
+                raise RuntimeError(f"Failed to load {parser.source_system} data into Snowflake")
+
+            logger.info(f"✅ Successfully loaded {nrows} rows into {parser.raw_table}")
+
+        # --- Record fingerprints only after the rows are written ---
+        files_df = pd.DataFrame(
+            [
+                {
+                    "SOURCE_SYSTEM": parser.source_system,
+                    "SOURCE_FILE": os.path.basename(path),
+                    "FILE_FINGERPRINT": fingerprint,
+                    "ROW_COUNT": len(df),
+                    "LOAD_TS": load_ts
+                }
+                for path, fingerprint, df in parsed_files
+            ]
+        )
+        success, nchunks, nrows, _ = write_pandas(
+            conn=ctx,
+            df=files_df,
+            table_name=RAW_LOADED_FILES_TABLE,
+            schema="RAW"
+        )
+
+        if not success:
+            raise RuntimeError(f"Failed to record {parser.source_system} files in {RAW_LOADED_FILES_TABLE}")
+
+        logger.info(f"Recorded {nrows} files in {RAW_LOADED_FILES_TABLE}")
+
+    finally:
+        cs.close()
+
+
+def load_broker_transactions(ctx):
+    """
+    Load transaction exports of every registered broker from the inbox into Snowflake.
+    Files are detected and parsed in parallel; files whose fingerprint was
+    already loaded for their broker are skipped.
+    """
+    cs = ctx.cursor()
+    loaded_fingerprints = get_loaded_fingerprints(cs)
+    cs.close()
+
+    paths = list(scan_inbox(INBOX_PATH))
+    logger.info(f"Found {len(paths)} files in {INBOX_PATH}")
+
+    if not paths:
+        logger.warning("No broker files found to load!")
+        return
+
+    parsed = {}
+
+    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [executor.submit(parse_file, path, loaded_fingerprints) for path in paths]
+
+        for path, future in zip(paths, futures):
+            try:
+                source_system, path, fingerprint, df = future.result()
+            except Exception as e:
+                logger.error(f"Error processing {os.path.basename(path)}: {str(e)}")
+                continue
+
+            if source_system is None:
+                logger.info(f"Skipping {os.path.basename(path)}: no broker parser matches")
+            elif df is None:
+                logger.info(f"Skipping {os.path.basename(path)}: already loaded")
+            else:
+                parsed.setdefault(source_system, []).append((path, fingerprint, df))
+
+    if not parsed:
+        logger.info("No new broker files to load.")
+        return
+
+    load_ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    for parser in BROKER_PARSERS:
+        if parser.source_system in parsed:
+            load_broker(ctx, parser, parsed[parser.source_system], load_ts)
+
+
+if __name__ == "__main__":
+    ctx = get_connection()
+    load_broker_transactions(ctx)
+    ctx.close()
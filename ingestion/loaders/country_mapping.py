@@ -1,111 +1,182 @@
+import json
+import hashlib
+import logging
+import os
+
 import pandas as pd
 import pycountry
 import pycountry_convert as pc
-import snowflake.connector
-import os
 from snowflake.connector.pandas_tools import write_pandas
 
-# --- Snowflake connection ---
-USER = os.environ['SNOWFLAKE_USER']
-PWD = os.environ['SNOWFLAKE_PWD']
-WH = os.environ['SNOWFLAKE_WH']
-ACCOUNT = os.environ['SNOWFLAKE_ACCOUNT']
-DATABASE = 'INVESTMENTS'
-SCHEMA = 'RAW'
-RAW_TRADES_TABLE = 'RAW_TRANSACTIONS_XTB'
-RAW_SYMBOL_COUNTRY_TABLE = 'RAW_STOCK_COUNTRY_MAPPING'
-
-ctx = snowflake.connector.connect(
-    user=USER,
-    password=PWD,
-    account=ACCOUNT,
-    warehouse=WH,
-    database=DATABASE,
-    schema=SCHEMA
-)
-
-# --- Fetch distinct symbols from raw_trades ---
-df_symbols = pd.read_sql(
-    f"SELECT DISTINCT SYMBOL FROM {SCHEMA}.{RAW_TRADES_TABLE} WHERE TYPE = 'Stock purchase'",
-    ctx
-)
-
-# --- Fetch existing symbols from country mapping ---
-df_existing = pd.read_sql(f"SELECT SYMBOL FROM {SCHEMA}.{RAW_SYMBOL_COUNTRY_TABLE}", ctx)
-existing_set = set(df_existing['SYMBOL'])
-
-# --- Filter new symbols only ---
-df_new = df_symbols[~df_symbols['SYMBOL'].isin(existing_set)]
-
-if df_new.empty:
-    print("No new symbols to process.")
-else:
-    # --- Extract suffix ---
-    df_new['SUFFIX'] = df_new['SYMBOL'].apply(
-        lambda x: x.split('.')[-1] if x and '.' in x else 'US'
+from ingestion.snowflake_connection import get_connection
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+# --- Tables ---
+RAW_TRADES_TABLE = "RAW_TRANSACTIONS_XTB"
+RAW_SYMBOL_COUNTRY_TABLE = "RAW_STOCK_COUNTRY_MAPPING"
+
+# --- On-disk cache of the suffix lookup (rebuilt when missing, unreadable or stale) ---
+CACHE_PATH = os.path.join(os.path.dirname(__file__), ".cache", "country_mapping.json")
+
+# --- Manual mapping for Yahoo exceptions ---
+YAHOO_EXCEPTIONS = {
+    "FR": "PA",
+    "IT": "MI",
+    "NL": "AS",
+    "BE": "BR",   # correct Yahoo suffix for Belgium
+    "DE": "DE",
+    "UK": "L",
+    "US": ""
+}
+
+# --- Manual mapping for country code exceptions ---
+ISO_COUNTRY_MAPPING = {
+    "UK": "GB",   # UK symbols use GB for ISO country lookup
+    # Add other exceptions as needed
+}
+
+CONTINENTS = {
+    "AF": "Africa",
+    "AS": "Asia",
+    "EU": "Europe",
+    "NA": "North America",
+    "SA": "South America",
+    "OC": "Oceania",
+    "AN": "Antarctica"
+}
+
+
+def get_continent(alpha2):
+    try:
+        return CONTINENTS.get(pc.country_alpha2_to_continent_code(alpha2))
+    except Exception:
+        return None
+
+
+def build_suffix_lookup():
+    """
+    Builds the suffix -> (YF_SUFFIX, COUNTRY_NAME, CONTINENT) lookup for every
+    ISO alpha-2 code plus the non-standard suffixes used by XTB (e.g. UK).
+    """
+    lookup = {}
+
+    for country in pycountry.countries:
+        suffix = country.alpha_2
+        lookup[suffix] = (YAHOO_EXCEPTIONS.get(suffix, suffix), country.name, get_continent(suffix))
+
+    for suffix, iso_code in ISO_COUNTRY_MAPPING.items():
+        country = pycountry.countries.get(alpha_2=iso_code)
+        lookup[suffix] = (
+            YAHOO_EXCEPTIONS.get(suffix, suffix),
+            country.name if country else None,
+            get_continent(iso_code)
+        )
+
+    return lookup
+
+
+def lookup_version():
+    """
+    Returns a key identifying the inputs of the suffix lookup: the manual
+    mappings and the pycountry version. A cache with another key is stale.
+    """
+    inputs = json.dumps(
+        [YAHOO_EXCEPTIONS, ISO_COUNTRY_MAPPING, CONTINENTS, pycountry.__version__],
+        sort_keys=True
     )
-    
-    # --- Manual mapping for Yahoo exceptions ---
-    yahoo_exceptions = {
-        'FR': 'PA',
-        'IT': 'MI',
-        'NL': 'AS',
-        'BE': 'BR',   # correct Yahoo suffix for Belgium
-        'DE': 'DE',
-        'UK': 'L',
-        'US': ''
-    }
-    df_new['YF_SUFFIX'] = df_new['SUFFIX'].apply(lambda s: yahoo_exceptions.get(s, s))
-    
-    # --- Manual mapping for country code exceptions ---
-    iso_country_mapping = {
-        'UK': 'GB',   # UK symbols use GB for ISO country lookup
-        # Add other exceptions as needed
-    }
-    
-    # --- Get country name ---
-    def get_country_name(suffix):
-        try:
-            # Apply mapping for non-standard codes like UK -> GB
-            lookup_code = iso_country_mapping.get(suffix, suffix)
-            country = pycountry.countries.get(alpha_2=lookup_code)
-            return country.name if country else None
-        except Exception:
-            return None
-    
-    # --- Get continent ---
-    def get_continent(alpha2):
-        try:
-            # Apply mapping for non-standard codes like UK -> GB
-            lookup_code = iso_country_mapping.get(alpha2, alpha2)
-            continent_code = pc.country_alpha2_to_continent_code(lookup_code)
-            continents = {
-                'AF': 'Africa',
-                'AS': 'Asia',
-                'EU': 'Europe',
-                'NA': 'North America',
-                'SA': 'South America',
-                'OC': 'Oceania',
-                'AN': 'Antarctica'
-            }
-            return continents.get(continent_code)
-        except Exception:
-            return None
-    
-    df_new['COUNTRY_NAME'] = df_new['SUFFIX'].apply(get_country_name)
-    df_new['CONTINENT'] = df_new['SUFFIX'].apply(get_continent)
-    df_new['SOURCE_SYSTEM'] = 'pycountry library'
-    
+    return hashlib.sha256(inputs.encode()).hexdigest()
+
+
+def get_suffix_lookup():
+    """
+    Returns the suffix lookup from the on-disk cache, building and caching it
+    on first use or when the mappings or pycountry version changed.
+    """
+    version = lookup_version()
+
+    try:
+        with open(CACHE_PATH) as f:
+            cache = json.load(f)
+
+        if cache.get("version") == version:
+            lookup = {suffix: tuple(values) for suffix, values in cache["lookup"].items()}
+            logger.info(f"Loaded {len(lookup)} suffixes from {CACHE_PATH}")
+            return lookup
+
+        logger.info("Suffix lookup cache is stale, rebuilding it")
+    except (OSError, ValueError, KeyError, AttributeError):
+        logger.info("Suffix lookup cache not found, building it")
+
+    lookup = build_suffix_lookup()
+
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    with open(CACHE_PATH, "w") as f:
+        json.dump({"version": version, "lookup": lookup}, f)
+
+    logger.info(f"Cached {len(lookup)} suffixes to {CACHE_PATH}")
+    return lookup
+
+
+def enrich_symbols(df, lookup):
+    """Adds SUFFIX, YF_SUFFIX, COUNTRY_NAME and CONTINENT to a frame of SYMBOLs."""
+    df = df.copy()
+
+    # --- Extract suffix (symbols without one are US listings) ---
+    df["SUFFIX"] = df["SYMBOL"].str.extract(r"\.([^.]+)$", expand=False).fillna("US")
+
+    suffixes = df["SUFFIX"]
+    df["YF_SUFFIX"] = suffixes.map({s: v[0] for s, v in lookup.items()}).fillna(suffixes)
+    df["COUNTRY_NAME"] = suffixes.map({s: v[1] for s, v in lookup.items()})
+    df["CONTINENT"] = suffixes.map({s: v[2] for s, v in lookup.items()})
+    df["SOURCE_SYSTEM"] = "pycountry library"
+
+    return df
+
+
+def load_country_mapping(ctx):
+    """Map new XTB symbols to their Yahoo suffix, country and continent."""
+
+    cs = ctx.cursor()
+
+    # --- Fetch symbols not yet in the country mapping ---
+    cs.execute(
+        f"""
+        SELECT DISTINCT SYMBOL
+        FROM RAW.{RAW_TRADES_TABLE}
+        WHERE TYPE = 'Stock purchase'
+          AND SYMBOL IS NOT NULL
+          AND SYMBOL NOT IN (SELECT SYMBOL FROM RAW.{RAW_SYMBOL_COUNTRY_TABLE} WHERE SYMBOL IS NOT NULL)
+        """
+    )
+
+    df_new = pd.DataFrame(cs.fetchall(), columns=["SYMBOL"])
+
+    if df_new.empty:
+        logger.info("No new symbols to process.")
+        cs.close()
+        return
+
+    logger.info(f"Found {len(df_new)} new symbols to map")
+
+    df_new = enrich_symbols(df_new, get_suffix_lookup())
+
     # --- Final columns ---
-    df_final = df_new[['SYMBOL', 'SUFFIX', 'YF_SUFFIX', 'COUNTRY_NAME', 'CONTINENT', 'SOURCE_SYSTEM']]
-    
+    df_final = df_new[["SYMBOL", "SUFFIX", "YF_SUFFIX", "COUNTRY_NAME", "CONTINENT", "SOURCE_SYSTEM"]]
+
     # --- Write new rows to Snowflake ---
-    success, nchunks, nrows, *_ = write_pandas(ctx, df_final, RAW_SYMBOL_COUNTRY_TABLE, schema=SCHEMA)
-    
+    success, nchunks, nrows, _ = write_pandas(ctx, df_final, RAW_SYMBOL_COUNTRY_TABLE, schema="RAW")
+
     if success:
-        print(f"Inserted {nrows} new symbols into {RAW_SYMBOL_COUNTRY_TABLE}.")
+        logger.info(f"✅ Inserted {nrows} new symbols into {RAW_SYMBOL_COUNTRY_TABLE}")
     else:
-        print("Failed to insert new symbols.")
+        logger.error("❌ Failed to insert new symbols")
+
+    cs.close()
+
 
-# --- Close connection ---
-ctx.close()
\ No newline at end of file
+if __name__ == "__main__":
+    ctx = get_connection()
+    load_country_mapping(ctx)
+    ctx.close()
@@ -2,14 +2,17 @@
 Pipeline orchestrator - runs all raw data loaders in sequence.
 """
 import sys
+import json
 import logging
+import argparse
 import inspect
 import subprocess
 
 from ingestion.snowflake_connection import get_connection
 from ingestion.loaders.exchange_rates_loader import load_exchange_rates
 from ingestion.loaders.asset_prices_loader import load_asset_prices
-from ingestion.loaders.transactions_xtb_loader import load_xtb_transactions
+from ingestion.loaders.broker_transactions_loader import load_broker_transactions
+from ingestion.loaders.country_mapping import load_country_mapping
 from ingestion.loaders.asset_details_loader import fetch_assets_from_seed
 
 
@@ -21,10 +24,11 @@ logger = logging.getLogger(__name__)
 # --- Loader registry ---
 # Add or remove loaders here. Order matters — loaders run sequentially.
 LOADERS = [
-    ("Exchange Rates",   load_exchange_rates),
-    ("Asset Prices",     load_asset_prices),
-    ("Transactions XTB", load_xtb_transactions),
-    ("Asset Details",    fetch_assets_from_seed),
+    ("Exchange Rates",      load_exchange_rates),
+    ("Asset Prices",        load_asset_prices),
+    ("Broker Transactions", load_broker_transactions),
+    ("Country Mapping",     load_country_mapping),
+    ("Asset Details",       fetch_assets_from_seed),
 ]
 
 
@@ -67,15 +71,22 @@ def run_dbt_run():
     logger.info("✅ dbt run completed successfully")
 
 
-def run_dbt_test():
+def run_dbt_test(full_scan=False):
     """
     Runs `dbt test` to validate all models after they are built.
+    By default tests only check rows loaded since the last successful test
+    watermark (see macros/incremental_test_filter.sql); full_scan=True checks
+    entire tables, e.g. for a weekly run.
+    On success the watermarks are advanced to the rows just tested.
     """
+    mode = "full scan" if full_scan else "incremental"
+
     logger.info("="*60)
-    logger.info("🧪 Running dbt tests...")
+    logger.info(f"🧪 Running dbt tests ({mode})...")
     logger.info("="*60)
 
-    result = subprocess.run(["dbt", "test"])
+    test_vars = json.dumps({"incremental_tests": not full_scan})
+    result = subprocess.run(["dbt", "test", "--vars", test_vars])
 
     if result.returncode != 0:
         logger.error("❌ dbt test failed")
@@ -83,6 +94,14 @@ def run_dbt_test():
 
     logger.info("✅ dbt test completed successfully")
 
+    result = subprocess.run(["dbt", "run-operation", "update_test_watermarks"])
+
+    if result.returncode != 0:
+        logger.error("❌ Updating test watermarks failed")
+        sys.exit(1)
+
+    logger.info("✅ Test watermarks updated")
+
 
 def run_loader(name, func, ctx):
     """
@@ -123,7 +142,19 @@ def run_loaders(ctx):
             sys.exit(1)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the investments data pipeline.")
+    parser.add_argument(
+        "--full-test-scan",
+        action="store_true",
+        help="Run dbt tests against full tables instead of rows loaded since the last test watermark"
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     logger.info("="*60)
     logger.info("🚀 STARTING DATA PIPELINE")
     logger.info("="*60)
@@ -149,7 +180,8 @@ def main():
     run_dbt_run()
 
     # Step 6: Run dbt tests to validate the data
-    run_dbt_test()
+    # (only new rows unless --full-test-scan is passed)
+    run_dbt_test(full_scan=args.full_test_scan)
 
     logger.info("="*60)
     logger.info("🏁 PIPELINE COMPLETED SUCCESSFULLY!")
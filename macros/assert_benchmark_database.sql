@@ -0,0 +1,27 @@
+{#
+    Guard for benchmarks/run_benchmarks.py: synthetic data must never be
+    pushed to or modelled in the production INVESTMENTS database. Passes only
+    when the target database and the raw_database var name the same,
+    non-production database.
+#}
+
+{% macro assert_benchmark_database() %}
+    {% set target_database = target.database | upper %}
+    {% set raw_database = var('raw_database', 'INVESTMENTS') | upper %}
+
+    {% if target_database == 'INVESTMENTS' or raw_database == 'INVESTMENTS' %}
+        {{ exceptions.raise_compiler_error(
+            "Refusing to benchmark against the production INVESTMENTS database (target: "
+            ~ target_database ~ ", raw_database: " ~ raw_database ~ ")"
+        ) }}
+    {% endif %}
+
+    {% if target_database != raw_database %}
+        {{ exceptions.raise_compiler_error(
+            "Benchmark target database " ~ target_database
+            ~ " does not match raw_database " ~ raw_database
+        ) }}
+    {% endif %}
+
+    {{ log("Benchmark database: " ~ target_database, info=True) }}
+{% endmacro %}
@@ -0,0 +1,9 @@
+{% macro incremental_date_id_filter(date_id_column, lookback_days=7) %}
+    {{ date_id_column }} >= (
+        SELECT COALESCE(
+            TO_NUMBER(TO_VARCHAR(DATEADD(day, -{{ lookback_days }}, TO_DATE(TO_VARCHAR(MAX(DATE_ID)), 'YYYYMMDD')), 'YYYYMMDD')),
+            0
+        )
+        FROM {{ this }}
+    )
+{% endmacro %}
@@ -0,0 +1,111 @@
+{#
+    Incremental data-quality tests
+
+    When run with --vars '{incremental_tests: true}', tests only check rows
+    loaded (LOAD_TS) after the watermark recorded by the last successful test
+    run. Without the var they scan the full table (weekly/ad-hoc runs).
+
+    - Singular tests wrap their WHERE clause with incremental_test_filter().
+    - Generic (YAML) tests on the models in var('incremental_test_models') are
+      narrowed by the get_where_subquery() override below:
+        * not_null, accepted_values, relationships: only the new rows.
+        * unique, unique_combination_of_columns: every row (old or new) whose
+          key appears among the new rows, so a new row duplicating an old key
+          still fails.
+
+    Left as full scans on purpose:
+    - Generic tests on any other model (dim_*, stg_asset, int_*,
+      fct_asset_prices, fct_asset_prices_eur, fct_exchange_rates,
+      fct_portfolio_snapshots_daily). They are rebuilt or have no LOAD_TS
+      watermark.
+    - Any other generic test type, as it is unknown whether new rows alone
+      are enough to check it.
+
+    Watermarks live in RAW.DBT_TEST_WATERMARKS, one row per model, and are
+    advanced by `dbt run-operation update_test_watermarks` after `dbt test`
+    passes (see ingestion/run_loaders.py).
+#}
+
+{% macro test_watermarks_relation() %}
+    {{ target.database }}.RAW.DBT_TEST_WATERMARKS
+{% endmacro %}
+
+
+{% macro create_test_watermarks_table() %}
+    CREATE TABLE IF NOT EXISTS {{ test_watermarks_relation() }} (
+        MODEL_NAME VARCHAR(255) NOT NULL,
+        WATERMARK_TS TIMESTAMP_NTZ(9) NOT NULL,
+        DBT_UPDATED_AT TIMESTAMP_NTZ(9) NOT NULL
+    )
+{% endmacro %}
+
+
+{% macro incremental_test_filter(model, load_ts_column='LOAD_TS') %}
+    {%- if var('incremental_tests', false) -%}
+    {{ load_ts_column }} > (
+        SELECT COALESCE(MAX(WATERMARK_TS), '1900-01-01'::TIMESTAMP_NTZ)
+        FROM {{ test_watermarks_relation() }}
+        WHERE MODEL_NAME = '{{ model.identifier | upper }}'
+    )
+    {%- else -%}
+    1 = 1
+    {%- endif -%}
+{% endmacro %}
+
+
+{% macro get_where_subquery(relation) %}
+    {%- set where = config.get('where', '') -%}
+    {%- set test_name = model.test_metadata.name if model.test_metadata else none -%}
+    {%- set test_kwargs = model.test_metadata.kwargs if model.test_metadata else {} -%}
+    {%- set watermarked = relation.identifier | upper in var('incremental_test_models') | map('upper') | list -%}
+
+    {%- set key_columns = none -%}
+    {%- if test_name == 'unique' -%}
+        {%- set key_columns = [test_kwargs['column_name']] -%}
+    {%- elif test_name == 'unique_combination_of_columns' -%}
+        {%- set key_columns = test_kwargs['combination_of_columns'] -%}
+    {%- endif -%}
+
+    {%- set row_filters = [where] if where else [] -%}
+
+    {%- if var('incremental_tests', false) and watermarked -%}
+        {%- if key_columns is not none -%}
+            {%- set keys = key_columns | join(', ') -%}
+            {%- do row_filters.append(
+                "(" ~ keys ~ ") IN (SELECT " ~ keys ~ " FROM " ~ relation
+                ~ " WHERE " ~ incremental_test_filter(relation) ~ ")"
+            ) -%}
+        {%- elif test_name in ['not_null', 'accepted_values', 'relationships'] -%}
+            {%- do row_filters.append(incremental_test_filter(relation)) -%}
+        {%- endif -%}
+    {%- endif -%}
+
+    {%- if row_filters -%}
+        {%- do return("(SELECT * FROM " ~ relation ~ " WHERE " ~ row_filters | join(" AND ") ~ ") dbt_subquery") -%}
+    {%- else -%}
+        {%- do return(relation) -%}
+    {%- endif -%}
+{% endmacro %}
+
+
+{% macro update_test_watermarks() %}
+    {% do run_query(create_test_watermarks_table()) %}
+
+    {% for model_name in var('incremental_test_models') %}
+        {% set model = ref(model_name) %}
+        {% do run_query(
+            "MERGE INTO " ~ test_watermarks_relation() ~ " WTMK
+            USING (
+                SELECT '" ~ model.identifier | upper ~ "' AS MODEL_NAME, MAX(LOAD_TS) AS WATERMARK_TS
+                FROM " ~ model ~ "
+            ) SRC
+                ON WTMK.MODEL_NAME = SRC.MODEL_NAME
+            WHEN MATCHED AND SRC.WATERMARK_TS IS NOT NULL THEN UPDATE SET
+                WATERMARK_TS = SRC.WATERMARK_TS,
+                DBT_UPDATED_AT = " ~ dbt_updated_at() ~ "
+            WHEN NOT MATCHED AND SRC.WATERMARK_TS IS NOT NULL THEN INSERT (MODEL_NAME, WATERMARK_TS, DBT_UPDATED_AT)
+                VALUES (SRC.MODEL_NAME, SRC.WATERMARK_TS, " ~ dbt_updated_at() ~ ")"
+        ) %}
+        {{ log("Test watermark updated for " ~ model_name, info=True) }}
+    {% endfor %}
+{% endmacro %}
@@ -0,0 +1,73 @@
+/*
+    Asset Prices in EUR
+
+    Purpose: Stores the forward-filled adjusted close of every asset already
+    converted to EUR, so snapshot models and BI queries read one row per
+    asset-day instead of joining prices, currencies and exchange rates.
+
+    Grain: One row per asset per date, up to yesterday
+
+    Incremental: only the trailing `asset_prices_eur_lookback_days` (default 7)
+    are recomputed and merged, which also picks up late-arriving prices/rates
+    that change the forward-fill of recent days. Assets not yet in the mart
+    are loaded with their full history. Run with --full-refresh after
+    backfilling older prices or rates of assets already in the mart.
+*/
+
+{{
+    config(
+        materialized = 'incremental',
+        unique_key = ['ASSET_ID', 'DATE_ID'],
+        incremental_strategy = 'merge'
+    )
+}}
+
+WITH asset_prices AS (
+    SELECT
+        ASPR.ASSET_ID,
+        ASPR.PRICE_DATE_ID AS DATE_ID,
+        ASPR.PRICE_CURRENCY_ID,
+        ASPR.PRICE_ADJ_CLOSE
+    FROM {{ ref('fct_asset_prices') }} ASPR
+    WHERE ASPR.PRICE_DATE_ID <= TO_NUMBER(TO_VARCHAR(CURRENT_DATE - 1, 'YYYYMMDD'))
+    {% if is_incremental() %}
+      AND (
+            {{ incremental_date_id_filter('ASPR.PRICE_DATE_ID', var('asset_prices_eur_lookback_days', 7)) }}
+            -- Assets not yet in the mart (e.g. newly traded, backfilled by the
+            -- prices loader) are loaded with their full history
+            OR NOT EXISTS (
+                SELECT 1
+                FROM {{ this }} MART
+                WHERE MART.ASSET_ID = ASPR.ASSET_ID
+            )
+      )
+    {% endif %}
+),
+
+-- Exchange rates are already forward-filled for every date/currency pair by
+-- fct_exchange_rates; only the EUR-to-EUR identity rate is added here.
+converted AS (
+    SELECT
+        ASPR.ASSET_ID,
+        ASPR.DATE_ID,
+        ASPR.PRICE_CURRENCY_ID,
+        ASPR.PRICE_ADJ_CLOSE,
+        CASE
+            WHEN CURR.CURRENCY_ABRV = 'EUR' THEN 1
+            ELSE EXRA.EXCHANGE_RATE
+        END                                                    AS EXCHANGE_RATE_EUR,
+        -- Default FX rate to 1 if missing, as the snapshot model always did
+        CAST(
+            ASPR.PRICE_ADJ_CLOSE * COALESCE(EXCHANGE_RATE_EUR, 1)
+            AS DECIMAL(18, 6)
+        )                                                      AS PRICE_ADJ_CLOSE_EUR,
+        {{ dbt_updated_at() }}                                 AS DBT_UPDATED_AT
+    FROM asset_prices ASPR
+    LEFT JOIN {{ ref('dim_currency') }} CURR
+        ON CURR.CURRENCY_ID = ASPR.PRICE_CURRENCY_ID
+    LEFT JOIN {{ ref('fct_exchange_rates') }} EXRA
+        ON EXRA.RATE_DATE_ID     = ASPR.DATE_ID
+        AND EXRA.CURRENCY_ID_FROM = ASPR.PRICE_CURRENCY_ID
+)
+
+SELECT * FROM converted
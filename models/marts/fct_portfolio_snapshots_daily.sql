@@ -4,9 +4,9 @@
     Purpose: Creates daily snapshots of portfolio positions and valuations
     
     Features:
-    - Forward-fills stock prices and exchange rates for non-trading days (weekends/holidays)
+    - Uses forward-filled EUR prices from fct_asset_prices_eur for non-trading days (weekends/holidays)
     - Calculates cumulative positions (running total of shares owned)
-    - Converts all positions to EUR for unified reporting
+    - Values all positions in EUR for unified reporting
     - Tracks only currently held positions (excludes fully sold tickers)
     
     Grain: One row per ticker per date
@@ -41,37 +41,15 @@ WITH calendar AS (
     CROSS JOIN {{ ref('dim_asset') }} asse
 )
 
--- Exchange rates are already forward-filled for every date/currency pair by
--- fct_exchange_rates; only the EUR-to-EUR identity rate is added here.
-, exchange_rates AS (
-    SELECT
-        exra.rate_date_id
-    ,   exra.currency_id_from
-    ,   exra.currency_id_to
-    ,   CASE
-            WHEN curr.currency_abrv = 'EUR' THEN 1
-            ELSE exra.exchange_rate
-        END AS exchange_rate_filled
-    FROM {{ ref('fct_exchange_rates') }} exra
-    LEFT JOIN {{ ref('dim_currency') }} curr
-        ON curr.currency_id = exra.currency_id_from
-)
-
--- Enrich forward-filled asset prices (fct_asset_prices) with asset and
--- currency metadata. Price remains in native currency at this stage (USD, EUR, etc.)
+-- Forward-filled asset prices already converted to EUR (fct_asset_prices_eur),
+-- so no per-row currency or exchange rate lookups are needed here
 , asset_prices AS (
     SELECT
-        stpr.price_date_id
-    ,   asse.asset_id
-    ,   stpr.price_currency_id
-    ,   curr.currency_abrv
-    ,   asse.asset_code
-    ,   stpr.price_adj_close AS price_adj_close_filled
-    FROM {{ ref('fct_asset_prices') }} stpr
-    LEFT JOIN {{ ref('dim_asset') }} asse
-        ON asse.asset_id = stpr.asset_id
-    LEFT JOIN {{ ref('dim_currency') }} curr
-        ON curr.currency_id = stpr.price_currency_id
+        aspr.date_id
+    ,   aspr.asset_id
+    ,   aspr.price_currency_id
+    ,   aspr.price_adj_close_eur
+    FROM {{ ref('fct_asset_prices_eur') }} aspr
 )
 
 -- Normalize all buy/sell transactions
@@ -127,9 +105,9 @@ WITH calendar AS (
             ORDER BY tida.date_id
         ) AS amount_invested_cumulative
     
-        -- Current market value: (cumulative shares) × (current price in native currency) × (FX rate to EUR)
+        -- Current market value: (cumulative shares) × (current price in EUR)
     ,   CAST(
-            quantity_cumulative * stpr.price_adj_close_filled * COALESCE(exra.exchange_rate_filled, 1) -- Default FX rate to 1 if missing (e.g., EUR to EUR)     
+            quantity_cumulative * stpr.price_adj_close_eur
             AS DECIMAL(10,2)
         ) AS portfolio_value_eur
     
@@ -144,15 +122,10 @@ WITH calendar AS (
         ON trad.transaction_date_id = tida.date_id
         AND trad.asset_id = tida.asset_id
     
-    -- Get forward-filled asset price in native currency
+    -- Get forward-filled asset price converted to EUR
     LEFT JOIN asset_prices stpr
-        ON stpr.price_date_id = tida.date_id
+        ON stpr.date_id = tida.date_id
         AND stpr.asset_id = tida.asset_id
-    
-    -- Get forward-filled exchange rate to convert to EUR
-    LEFT JOIN exchange_rates exra
-        ON exra.rate_date_id = tida.date_id
-        AND exra.currency_id_from = stpr.price_currency_id
 )
 
 SELECT * FROM daily_snapshot WHERE portfolio_value_eur > 0
\ No newline at end of file
@@ -7,3 +7,4 @@ INNER JOIN {{ ref('dim_transaction_type') }} TRTY
     ON TRTY.TRANSACTION_TYPE_ID = FCT.TRANSACTION_TYPE_ID
 WHERE TRTY.TRANSACTION_TYPE IN ('BUY', 'SELL')
   AND FCT.ASSET_ID IS NULL
+  AND {{ incremental_test_filter(ref('fct_transactions'), 'FCT.LOAD_TS') }}
@@ -2,7 +2,8 @@ SELECT
     ASSET_ID
 FROM {{ref('fct_transactions')}}
 WHERE TRANSACTION_TYPE_ID IN ('11441cc5a2e90d0a3462f4d5036d3c59','f284e5640a390198e05c593e09286d01') --Stock Purchase and Stock Sale
+  AND {{ incremental_test_filter(ref('fct_transactions')) }}
 EXCEPT
 SELECT
     ASSET_ID
-FROM {{ref('dim_asset')}}
\ No newline at end of file
+FROM {{ref('dim_asset')}}
@@ -1,4 +1,5 @@
 -- Test that no asset prices occurred after they were loaded into the system
 SELECT *
 FROM {{ ref('stg_asset_prices') }}
-WHERE PRICE_DATE > LOAD_TS
\ No newline at end of file
+WHERE PRICE_DATE > LOAD_TS
+  AND {{ incremental_test_filter(ref('stg_asset_prices')) }}
@@ -1,4 +1,5 @@
 -- Test that no trades occurred after they were loaded into the system
 SELECT *
 FROM {{ ref('stg_exchange_rates') }}
-WHERE RATE_DATE > LOAD_TS
\ No newline at end of file
+WHERE RATE_DATE > LOAD_TS
+  AND {{ incremental_test_filter(ref('stg_exchange_rates')) }}